@@ -22,42 +22,96 @@ from nicegui import ui, events
 import csv
 import html
 import random
-import re
 import sqlite3
 
 # -=-=-=-=-=- DATABASE SETUP & CONFIG -=-=-=-=-=-=-
 conn = sqlite3.connect('quick_games.db', check_same_thread=False)
 cursor = conn.cursor()
+# WAL journal + NORMAL sync: one fsync per checkpoint instead of several per commit
+cursor.execute('PRAGMA journal_mode=WAL')
+cursor.execute('PRAGMA synchronous=NORMAL')
+cursor.execute('PRAGMA temp_store=MEMORY')
+cursor.execute('PRAGMA cache_size=-20000')  # ~20 MB page cache
 cursor.execute('''
     CREATE TABLE IF NOT EXISTS games (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT NOT NULL UNIQUE
     )
 ''')
+cursor.execute('CREATE INDEX IF NOT EXISTS idx_games_name_nocase ON games (name COLLATE NOCASE)')
 conn.commit()
 
 # -=-=-=-=-=- GLOBAL -=-=-=-=-=-=-
 selected_game = None
-checkbox_states = {}  # Keeps game_name: bool for each checkbox
+shown_games = None  # The cached games list last pushed to games_table
+last_scroll_game = None  # Game of the last scrollTo sent to games_table
+_games_cache = None  # Sorted game names; reset to None whenever the table changes
+_lowered_games_cache = None  # (name, name.lower()) pairs matching _games_cache
+DELETE_CHUNK_SIZE = 500  # Max names per DELETE ... IN (...) statement
+SEARCH_DEBOUNCE_SECONDS = 0.15
+pending_search_timer = None
 
 # -=-=-=-=-=- FUNCTIONS -=-=-=-=-=-=-
 
 def get_all_games():
-    cursor.execute('SELECT name FROM games ORDER BY name')
-    return [row[0] for row in cursor.fetchall()]
+    global _games_cache
+    if _games_cache is None:
+        cursor.execute('SELECT name FROM games ORDER BY name COLLATE NOCASE')
+        _games_cache = [row[0] for row in cursor.fetchall()]
+    return _games_cache
+
+def get_lowered_games():
+    # (title, title.lower()) pairs for Python-side search, built once per cache fill
+    global _lowered_games_cache
+    if _lowered_games_cache is None:
+        _lowered_games_cache = [(title, title.lower()) for title in get_all_games()]
+    return _lowered_games_cache
+
+def invalidate_games_cache():
+    global _games_cache, _lowered_games_cache
+    _games_cache = None
+    _lowered_games_cache = None
+
+def is_word_char(char):
+    return char.isalnum() or char == '_'
+
+def starts_word(title_lower, term_lower):
+    # Same test as re's \b before the term: a word/non-word change right before the match
+    # (plain str.find, no regex engine)
+    term_is_word = is_word_char(term_lower[0])
+    pos = title_lower.find(term_lower)
+    while pos != -1:
+        before_is_word = pos > 0 and is_word_char(title_lower[pos - 1])
+        if before_is_word != term_is_word:
+            return True
+        pos = title_lower.find(term_lower, pos + 1)
+    return False
 
 def search_games(term):
     term = term.strip()
     if not term:
         return []
     term_lower = term.lower()
-    all_titles = get_all_games()
-    exact_matches = [title for title in all_titles if title.lower() == term_lower]
-    word_start_pattern = re.compile(rf'\b{re.escape(term_lower)}', re.IGNORECASE)
-    partial_matches = [
-        title for title in all_titles
-        if word_start_pattern.search(title.lower()) and title.lower() != term_lower
-    ]
+    if term.isascii():
+        cursor.execute('SELECT name FROM games WHERE name = ? COLLATE NOCASE ORDER BY name COLLATE NOCASE', (term,))
+        exact_matches = [row[0] for row in cursor.fetchall()]
+        # LIKE prunes the table to titles containing the term; starts_word then keeps word-start hits only
+        like_term = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        cursor.execute(
+            "SELECT name FROM games WHERE name LIKE '%' || ? || '%' ESCAPE '\\' "
+            "AND name <> ? COLLATE NOCASE ORDER BY name COLLATE NOCASE",
+            (like_term, term)
+        )
+        partial_matches = [row[0] for row in cursor.fetchall() if starts_word(row[0].lower(), term_lower)]
+        return exact_matches + partial_matches
+    # NOCASE and LIKE only fold ASCII case, so match non-ASCII terms with Python's lower()
+    exact_matches = []
+    partial_matches = []
+    for title, title_lower in get_lowered_games():
+        if title_lower == term_lower:
+            exact_matches.append(title)
+        elif starts_word(title_lower, term_lower):
+            partial_matches.append(title)
     return exact_matches + partial_matches
 
 def update_search_results():
@@ -77,32 +131,33 @@ def update_search_results():
             ui.label('No matches found.').classes('text-sm text-gray')
 
 def clear_search():
-    global selected_game, search_input, search_results
+    global selected_game, search_input, search_results, last_scroll_game, pending_search_timer
+    # Drop any debounced search so it can't repopulate results after the clear
+    if pending_search_timer is not None:
+        pending_search_timer.cancel()
+        pending_search_timer = None
     selected_game = None
+    last_scroll_game = None
     search_input.value = ''
     search_results.clear()
     refresh_all_games()
 
 def handle_csv_upload(e: events.UploadEventArguments):
     file = e.content.read().decode('utf-8').splitlines()
-    reader = csv.reader(file)
-    imported = 0
-    skipped = 0
-    for row in reader:
-        if row:
-            game = row[0].strip()
-            if game:
-                try:
-                    cursor.execute('INSERT INTO games (name) VALUES (?)', (game,))
-                    imported += 1
-                except sqlite3.IntegrityError:
-                    skipped += 1
-    conn.commit()
+    names = [row[0].strip() for row in csv.reader(file) if row]
+    names = [game for game in names if game]
+    # Dedupe within the file up front (keeps order), then bulk insert in one transaction
+    unique_names = list(dict.fromkeys(names))
+    with conn:
+        cursor.executemany('INSERT OR IGNORE INTO games (name) VALUES (?)', [(game,) for game in unique_names])
+    imported = max(cursor.rowcount, 0)
+    invalidate_games_cache()
+    skipped = len(names) - imported
     ui.notify(f"Imported: {imported}, Skipped: {skipped} (duplicates)", type='positive')
     refresh_all_games()
 
 def confirm_bulk_deletion():
-    selected_games = [game for game, checked in checkbox_states.items() if checked]
+    selected_games = [row['name'] for row in games_table.selected]
     if not selected_games:
         ui.notify("No games selected for deletion.", type='warning')
         return
@@ -110,10 +165,14 @@ def confirm_bulk_deletion():
     dialog = ui.dialog()
 
     def do_delete():
-        for game in selected_games:
-            cursor.execute('DELETE FROM games WHERE name = ?', (game,))
-            checkbox_states.pop(game, None)
+        # One IN (...) statement per chunk, kept under SQLite's bound-variable limit
+        for i in range(0, len(selected_games), DELETE_CHUNK_SIZE):
+            chunk = selected_games[i:i + DELETE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'DELETE FROM games WHERE name IN ({placeholders})', chunk)
         conn.commit()
+        invalidate_games_cache()
+        # refresh_all_games drops the deleted games' rows and their selection
         refresh_all_games()
         ui.notify(f"✅ Deleted {len(selected_games)} game(s).", type='positive')
         dialog.close()
@@ -142,6 +201,7 @@ def add_game(game):
     try:
         cursor.execute('INSERT INTO games (name) VALUES (?)', (game,))
         conn.commit()
+        invalidate_games_cache()
         add_result.text = f"✅  Added: {game}"
         add_result.classes('opacity-100').style('font-size: 15px; color: green;')
         ui.timer(3.0, lambda: (add_result.classes('opacity-0'), add_result.set_text('')), once=True)
@@ -155,10 +215,14 @@ def add_game(game):
 
 def pick_random():
     global random_result
-    games = get_all_games()
     random_result.clear()
-    if games:
-        choice = random.choice(games)
+    if _games_cache is not None:
+        choice = random.choice(_games_cache) if _games_cache else None
+    else:
+        # No cached list yet: let SQLite draw the row instead of loading every name
+        row = cursor.execute('SELECT name FROM games ORDER BY RANDOM() LIMIT 1').fetchone()
+        choice = row[0] if row else None
+    if choice is not None:
         with random_result:
             with ui.row().style(
                 "border: 2px solid #78b3f0; border-radius: 6px; padding: 4px 8px; margin-top: 1px; min-height: 33px;"
@@ -172,76 +236,56 @@ def pick_random():
         with random_result:
             ui.label("❗ No games in the database.")
 
-def create_checkbox(game_name):
-    if game_name not in checkbox_states:
-        checkbox_states[game_name] = False
-        
-    def on_change_handler(e):
-        checkbox_states[game_name] = e.value
-
-    checkbox = ui.checkbox().bind_value(checkbox_states, game_name).props('dense').style(
-        'transform: scale(0.8); padding: 0; margin: -3px;'
-    )
-    checkbox.on('change', on_change_handler)
-    return checkbox
-
 def refresh_all_games():
-    global all_games_column, games_label
-    all_games_column.clear()
+    global games_label, games_table, shown_games
     all_games = get_all_games()
     games_label.text = f'💿\u00A0\u00A0All Games ({len(all_games)})'
-    if all_games:
-        all_games.sort(key=lambda g: g.lower())
-        for game in all_games:
-            with all_games_column:
-                row_id = f'game-{game.replace(" ", "_")}'
-                with ui.row().classes('items-center').style('margin-left: -5px; gap: 4px; margin-bottom: -4px;').props(f'id={row_id}'):
-                    create_checkbox(game)
-                    ui.label(game).classes('text-sm').style(
-                        'line-height: 1.2; font-size: 14px; width: 310px; word-wrap: break-word; white-space: normal;'
-                        )
-    else:
-        with all_games_column:
-            ui.label('No games found.').classes('text-sm text-gray')
+    # The cache list is only replaced when the games change, so the same object means nothing to send
+    if all_games is shown_games:
+        return
+    shown_games = all_games
+    game_set = set(all_games)
+    games_table.rows = [{'name': game} for game in all_games]
+    games_table.selected = [row for row in games_table.selected if row['name'] in game_set]
 
 def select_all_games():
-    for game in get_all_games():
-        checkbox_states[game] = True
-    refresh_all_games()
+    games_table.selected = list(games_table.rows)
 
 def clear_selected_games():
-    for game in get_all_games():
-        checkbox_states[game] = False
-    refresh_all_games()
+    games_table.selected = []
 
-def scroll_to_game(game_name):
-    scroll_id = f'game-{game_name.replace(" ", "_")}'
-    ui.run_javascript(f'''
-        const el = document.getElementById("{scroll_id}");
-        if (el) el.scrollIntoView({{ behavior: "smooth", block: "center" }});
-    ''')
+def scroll_to_game(game_name, skip_if_same=False):
+    global last_scroll_game
+    if skip_if_same and game_name == last_scroll_game:
+        return
+    try:
+        index = get_all_games().index(game_name)
+    except ValueError:
+        return
+    last_scroll_game = game_name
+    # Virtual scroll only renders visible rows, so let QTable scroll to the row index
+    games_table.run_method('scrollTo', index, 'center-force')
 
-def handle_input():
-    global selected_game, search_input, search_results
+def handle_input(force_scroll=False):
+    global selected_game, search_input, search_results, last_scroll_game
     term = (search_input.value or '').strip()
     search_results.clear()
     if not term:
+        # Same reset as clear_search, so backspacing to empty behaves like the clear button
         selected_game = None
+        last_scroll_game = None
         refresh_all_games()
         return
     matches = search_games(term)
     if not matches:
+        last_scroll_game = None
         with search_results:
             ui.label('No matches found.').classes('text-sm text-gray')
         return
     if len(matches) == 1:
         selected_game = matches[0]
         refresh_all_games()
-        scroll_id = f'game-{selected_game.replace(" ", "_")}'
-        ui.run_javascript(f'''
-            const el = document.getElementById("{scroll_id}");
-            if (el) el.scrollIntoView({{ behavior: "smooth", block: "center" }});
-        ''')
+        scroll_to_game(selected_game, skip_if_same=not force_scroll)
     else:
         selected_game = None
         refresh_all_games()
@@ -253,11 +297,26 @@ def handle_input():
             .on('click', lambda g=game: scroll_to_game(g))
 
 
+def schedule_search():
+    # Debounce: each keystroke restarts the timer, so a burst of typing runs one search
+    global pending_search_timer
+    if pending_search_timer is not None:
+        pending_search_timer.cancel()
+    pending_search_timer = ui.timer(SEARCH_DEBOUNCE_SECONDS, run_pending_search, once=True)
+
+def run_pending_search(force_scroll=False):
+    global pending_search_timer
+    if pending_search_timer is not None:
+        pending_search_timer.cancel()
+        pending_search_timer = None
+    handle_input(force_scroll=force_scroll)
+
+
 # -=-=-=-=-=- MAIN UI -=-=-=-=-=-=-
 @ui.page('/')
 def main():
     global game_input, add_result, search_input, search_results
-    global games_label, all_games_column, random_result
+    global games_label, games_table, random_result, shown_games, last_scroll_game
 
     ui.add_head_html('''
     <link href="https://fonts.googleapis.com/css2?family=Lato&display=swap" rel="stylesheet">
@@ -276,6 +335,13 @@ def main():
         .hover-highlight:hover {
             background-color: #e3f2fd;
         }
+        /* Outranks Quasar's .q-table tbody td rules so long titles wrap like the old rows */
+        .games-list .q-table tbody td {
+            line-height: 1.2;
+            font-size: 14px;
+            white-space: normal;
+            word-wrap: break-word;
+        }
     </style>
     ''')
 
@@ -312,9 +378,10 @@ def main():
 
                 ui.label('🔍 Search').style('margin-top: 40px; font-weight: bold;')
                 search_input = ui.input(placeholder='Type in a game name...').props('lined dense clearable').style('width: 170px; margin-top: -10px;')
-                search_input.on('keydown.enter', lambda _: handle_input())
+                search_input.on('update:model-value', lambda _: schedule_search())
+                # Enter is an explicit jump request, so always scroll even if the target is unchanged
+                search_input.on('keydown.enter', lambda _: run_pending_search(force_scroll=True))
                 search_input.on('clear', lambda _: clear_search())
-                search_input.on('keydown.backspace', lambda _: clear_search())  
 
                 with ui.element().style(
                     'margin-top: 10px; width: 260px; height: 200px; overflow-y: auto; overflow-x: auto; '
@@ -326,8 +393,18 @@ def main():
 
             with ui.column().style('gap: 6px; min-width: 300px;'):
                 games_label = ui.label().style('font-weight: bold;')
-                # Set fixed width and height for the games column
-                all_games_column = ui.column().style('height: 250px; width: 380px; overflow-y: auto; border: 1px solid #ccc; padding: 10px;')
+                # One virtual-scrolled table with built-in selection instead of a row per game;
+                # fixed height so only the visible rows are rendered
+                games_table = ui.table(
+                    columns=[{'name': 'name', 'label': 'Game', 'field': 'name', 'align': 'left'}],
+                    rows=[],
+                    row_key='name',
+                    selection='multiple',
+                    pagination={'rowsPerPage': 0},
+                ).props('virtual-scroll dense flat hide-header hide-pagination no-data-label="No games found."')\
+                    .classes('games-list').style('height: 250px; width: 380px; border: 1px solid #ccc;')
+                shown_games = None
+                last_scroll_game = None
 
                 with ui.row().style('gap: 8px; margin-top: 6px;'):
                     ui.button('Select All', on_click=select_all_games).props('color=blue-4')\